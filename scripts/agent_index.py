@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Prebuilt search index for discovered A2A agents.
+Builds a SQLite FTS5 index + aggregated stats from crawl-discovered.json so that
+search and stats don't need a full scan of every agent (or every skill).
+
+Usage:
+    python3 scripts/agent_index.py build             # Incrementally (re)build the index
+    python3 scripts/agent_index.py search QUERY      # Search names, descriptions, skills, tags
+    python3 scripts/agent_index.py stats             # Aggregated skill/platform/protocol counts
+    python3 scripts/agent_index.py bench [QUERY...]  # Compare index vs substring scanning
+
+Python API:
+    idx = AgentIndex()
+    idx.update(agents)          # Only re-indexes agents whose content changed
+    idx.search("weather")       # -> [{"id", "name", "description", "url", ...}]
+    idx.stats()                 # -> {"total_agents", "total_skills", "platforms", ...}
+
+State files (in scripts/crawl-state/):
+    crawl-index.db          - SQLite index (derived from crawl-discovered.json, safe to delete)
+"""
+
+import json
+import re
+import sqlite3
+import hashlib
+import time
+import sys
+import urllib.parse
+from pathlib import Path
+
+# --- Config ---
+SCRIPT_DIR = Path(__file__).parent
+STATE_DIR = SCRIPT_DIR / "crawl-state"
+RESULTS_FILE = STATE_DIR / "crawl-discovered.json"
+INDEX_FILE = STATE_DIR / "crawl-index.db"
+SCHEMA_VERSION = 2
+MIN_PREFIX_LEN = 3   # shorter words match exactly on the unicode61 fallback
+
+# Hosting suffix -> platform label (mirrors the platforms in strategy_platforms)
+PLATFORM_SUFFIXES = [
+    (".vercel.app", "vercel"),
+    (".netlify.app", "netlify"),
+    (".fly.dev", "fly"),
+    (".railway.app", "railway"),
+    (".onrender.com", "render"),
+    (".render.com", "render"),
+    (".herokuapp.com", "heroku"),
+    (".workers.dev", "cloudflare"),
+    (".pages.dev", "cloudflare"),
+    (".web.app", "firebase"),
+    (".firebaseapp.com", "firebase"),
+    (".azurewebsites.net", "azure"),
+    (".koyeb.app", "koyeb"),
+    (".deno.dev", "deno"),
+    (".val.run", "val.town"),
+    (".replit.app", "replit"),
+    (".glitch.me", "glitch"),
+    (".surge.sh", "surge"),
+    (".streamlit.app", "streamlit"),
+    (".hf.space", "huggingface"),
+    (".modal.run", "modal"),
+    (".github.io", "github-pages"),
+]
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def text(value):
+    """Card fields are untrusted: anything that isn't a string indexes as ''."""
+    return value if isinstance(value, str) else ""
+
+def platform_for(agent):
+    """Guess the hosting platform from the agent URL ('custom' if unknown)."""
+    try:
+        host = urllib.parse.urlparse(text(agent.get("url"))).hostname or ""
+    except ValueError:  # e.g. "http://[oops"
+        return "custom"
+    for suffix, name in PLATFORM_SUFFIXES:
+        if host.endswith(suffix):
+            return name
+    return "custom"
+
+def protocol_version(agent):
+    """Protocol version string, or None when missing/empty/not a string."""
+    return text(agent.get("protocol_version")) or None
+
+def agent_skills(agent):
+    skills = agent.get("skills")
+    if not isinstance(skills, list):
+        return []
+    return [s for s in skills if isinstance(s, dict)]
+
+def agent_tags(agent):
+    tags = set()
+    for skill in agent_skills(agent):
+        skill_tags = skill.get("tags")
+        if isinstance(skill_tags, list):
+            tags.update(t for t in skill_tags if isinstance(t, str))
+    return sorted(tags)
+
+def like_escape(term):
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def agent_digest(agent):
+    """Content hash used to skip re-indexing unchanged agents."""
+    raw = json.dumps(agent, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+def load_agents(path=RESULTS_FILE):
+    if not Path(path).exists():
+        return []
+    return json.loads(Path(path).read_text()).get("agents", [])
+
+def naive_search(agents, q):
+    """Substring scan equivalent to the site's name/description ilike search."""
+    q = q.lower()
+    return [a for a in agents
+            if q in text(a.get("name")).lower() or q in text(a.get("description")).lower()]
+
+def naive_stats(agents):
+    """Full-scan stats, as getStats() does on the site."""
+    platforms, protocols = {}, {}
+    for a in agents:
+        p = platform_for(a)
+        platforms[p] = platforms.get(p, 0) + 1
+        v = protocol_version(a) or "unknown"
+        protocols[v] = protocols.get(v, 0) + 1
+    return {
+        "total_agents": len(agents),
+        "total_skills": sum(len(agent_skills(a)) for a in agents),
+        "platforms": platforms,
+        "protocol_versions": protocols,
+    }
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+class AgentIndex:
+    """SQLite FTS5 index over agent names, descriptions, skill names and tags.
+
+    Stats are kept in a `counts` table maintained by triggers, so reading them
+    never touches the agents themselves.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = Path(path) if path != ":memory:" else path
+        if self.path != ":memory:":
+            self.path.parent.mkdir(exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.row_factory = sqlite3.Row
+        self.trigram = False
+        self._init_schema()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _init_schema(self):
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            # Derived data: just rebuild on schema change
+            self.db.executescript("""
+                DROP TABLE IF EXISTS agents; DROP TABLE IF EXISTS agents_fts;
+                DROP TABLE IF EXISTS counts; DROP TABLE IF EXISTS meta;
+            """)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS agents (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                digest TEXT NOT NULL,
+                name TEXT, description TEXT, url TEXT, agent_card_url TEXT,
+                platform TEXT, protocol_version TEXT, skills_count INTEGER,
+                tags TEXT, data TEXT
+            );
+            CREATE TABLE IF NOT EXISTS counts (
+                kind TEXT NOT NULL, key TEXT NOT NULL, n INTEGER NOT NULL,
+                PRIMARY KEY (kind, key)
+            );
+            CREATE TRIGGER IF NOT EXISTS agents_ai AFTER INSERT ON agents BEGIN
+                INSERT INTO counts VALUES ('total', 'agents', 1)
+                    ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+                INSERT INTO counts VALUES ('total', 'skills', new.skills_count)
+                    ON CONFLICT (kind, key) DO UPDATE SET n = n + new.skills_count;
+                INSERT INTO counts VALUES ('platform', new.platform, 1)
+                    ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+                INSERT INTO counts VALUES ('protocol_version', coalesce(new.protocol_version, 'unknown'), 1)
+                    ON CONFLICT (kind, key) DO UPDATE SET n = n + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS agents_ad AFTER DELETE ON agents BEGIN
+                UPDATE counts SET n = n - 1 WHERE kind = 'total' AND key = 'agents';
+                UPDATE counts SET n = n - old.skills_count WHERE kind = 'total' AND key = 'skills';
+                UPDATE counts SET n = n - 1 WHERE kind = 'platform' AND key = old.platform;
+                UPDATE counts SET n = n - 1
+                    WHERE kind = 'protocol_version' AND key = coalesce(old.protocol_version, 'unknown');
+                DELETE FROM counts WHERE n <= 0 AND kind != 'total';
+            END;
+        """)
+        exists = self.db.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'agents_fts'").fetchone()
+        if exists:
+            self.trigram = "trigram" in exists[0]
+        else:
+            # trigram gives true substring matching (SQLite >= 3.34); fall back to words
+            for tokenizer in ("trigram", "unicode61 remove_diacritics 2"):
+                try:
+                    self.db.execute(f"CREATE VIRTUAL TABLE agents_fts USING fts5("
+                                    f"name, description, skills, tags, tokenize='{tokenizer}')")
+                    self.trigram = tokenizer == "trigram"
+                    break
+                except sqlite3.OperationalError:
+                    continue
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.commit()
+
+    # --- Writes ---
+
+    def update(self, agents):
+        """Incrementally sync the index with `agents`. Returns (added, updated, removed)."""
+        current = dict(self.db.execute("SELECT id, digest FROM agents").fetchall())
+        seen = set()
+        added = updated = 0
+        with self.db:
+            for agent in agents:
+                aid = agent.get("id")
+                if not isinstance(aid, str) or not aid or aid in seen:
+                    continue
+                seen.add(aid)
+                digest = agent_digest(agent)
+                if current.get(aid) == digest:
+                    continue
+                if aid in current:
+                    self._delete(aid)
+                    updated += 1
+                else:
+                    added += 1
+                self._insert(agent, digest)
+            removed = [aid for aid in current if aid not in seen]
+            for aid in removed:
+                self._delete(aid)
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('last_updated', datetime('now'))")
+        return added, updated, len(removed)
+
+    def _insert(self, agent, digest):
+        skills = agent_skills(agent)
+        tags = agent_tags(agent)
+        cur = self.db.execute(
+            "INSERT INTO agents (id, digest, name, description, url, agent_card_url, platform,"
+            " protocol_version, skills_count, tags, data) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+            (agent["id"], digest, text(agent.get("name")), text(agent.get("description")),
+             text(agent.get("url")), text(agent.get("agent_card_url")), platform_for(agent),
+             protocol_version(agent), len(skills), json.dumps(tags), json.dumps(agent, default=str)),
+        )
+        self.db.execute(
+            "INSERT INTO agents_fts (rowid, name, description, skills, tags) VALUES (?,?,?,?,?)",
+            (cur.lastrowid, text(agent.get("name")), text(agent.get("description")),
+             "\n".join(text(s.get("name")) for s in skills), "\n".join(tags)),
+        )
+
+    def _delete(self, aid):
+        row = self.db.execute("SELECT rowid FROM agents WHERE id = ?", (aid,)).fetchone()
+        if row:
+            self.db.execute("DELETE FROM agents_fts WHERE rowid = ?", (row[0],))
+            self.db.execute("DELETE FROM agents WHERE rowid = ?", (row[0],))
+
+    # --- Reads ---
+
+    def _match_expr(self, q):
+        """FTS5 MATCH expression for `q`, or None if nothing in it is searchable."""
+        terms = [t for t in q.split() if t]
+        if self.trigram:
+            return " AND ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        # unicode61 drops punctuation, so match on the word tokens the tokenizer would keep
+        words = [w for t in terms for w in re.findall(r"\w+", t)]
+        return " AND ".join(
+            f'"{w}"*' if len(w) >= MIN_PREFIX_LEN else f'"{w}"' for w in words) or None
+
+    def search(self, q, limit=50, offset=0):
+        """Rank agents matching every word of `q` (name/description/skill names/tags).
+
+        With the trigram tokenizer, any word shorter than 3 characters can't use
+        the index and falls back to LIKE, which scans every row.
+        """
+        q = (q or "").strip()
+        cols = ("a.id, a.name, a.description, a.url, a.agent_card_url, a.platform,"
+                " a.protocol_version, a.skills_count, a.tags")
+        if not q:
+            rows = self.db.execute(f"SELECT {cols} FROM agents a ORDER BY a.name LIMIT ? OFFSET ?",
+                                   (limit, offset)).fetchall()
+        elif self.trigram and any(len(t) < 3 for t in q.split()):
+            # Trigrams need >= 3 chars; short terms go through LIKE on the FTS columns
+            # (full scan, not O(matching rows))
+            where = " AND ".join(
+                "(f.name LIKE ? ESCAPE '\\' OR f.description LIKE ? ESCAPE '\\'"
+                " OR f.skills LIKE ? ESCAPE '\\' OR f.tags LIKE ? ESCAPE '\\')"
+                for _ in q.split())
+            args = [f"%{like_escape(t)}%" for t in q.split() for _ in range(4)]
+            rows = self.db.execute(
+                f"SELECT {cols} FROM agents_fts f JOIN agents a ON a.rowid = f.rowid"
+                f" WHERE {where} ORDER BY a.name LIMIT ? OFFSET ?",
+                (*args, limit, offset)).fetchall()
+        elif (expr := self._match_expr(q)) is None:
+            rows = []
+        else:
+            rows = self.db.execute(
+                f"SELECT {cols} FROM agents_fts f JOIN agents a ON a.rowid = f.rowid"
+                f" WHERE agents_fts MATCH ? ORDER BY bm25(agents_fts, 10.0, 2.0, 4.0, 3.0)"
+                f" LIMIT ? OFFSET ?",
+                (expr, limit, offset)).fetchall()
+        return [dict(r, tags=json.loads(r["tags"] or "[]")) for r in rows]
+
+    def get(self, aid):
+        row = self.db.execute("SELECT data FROM agents WHERE id = ?", (aid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        """Aggregated counts, read straight from the trigger-maintained table."""
+        out = {"total_agents": 0, "total_skills": 0, "platforms": {}, "protocol_versions": {}}
+        for kind, key, n in self.db.execute("SELECT kind, key, n FROM counts ORDER BY n DESC, key"):
+            if kind == "total":
+                out[f"total_{key}"] = n
+            elif kind == "platform":
+                out["platforms"][key] = n
+            elif kind == "protocol_version":
+                out["protocol_versions"][key] = n
+        return out
+
+
+def update_index(agents, path=INDEX_FILE):
+    """Sync the on-disk index with `agents`. Returns (added, updated, removed)."""
+    with AgentIndex(path) as idx:
+        return idx.update(agents)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def bench(agents, queries, scale=200, repeat=20, page=50):
+    """Compare FTS search/stats against substring scanning on a synthetic registry.
+
+    The discovered set is small, so it's replicated `scale` times (with unique ids)
+    to approximate a grown registry. Searches fetch one page of `page` results,
+    like the site's listing.
+    """
+    big = []
+    for i in range(scale):
+        for a in agents:
+            big.append(dict(a, id=f"{a.get('id')}-{i}"))
+    print(f"Benchmark: {len(big)} agents ({len(agents)} × {scale}), {repeat} repeats")
+
+    with AgentIndex(":memory:") as idx:
+        t = time.perf_counter()
+        idx.update(big)
+        print(f"  build:   {(time.perf_counter() - t) * 1000:8.1f} ms (trigram={idx.trigram})")
+        t = time.perf_counter()
+        idx.update(big)
+        print(f"  rebuild: {(time.perf_counter() - t) * 1000:8.1f} ms (no changes)")
+
+        def timed(fn):
+            t = time.perf_counter()
+            for _ in range(repeat):
+                result = fn()
+            return (time.perf_counter() - t) / repeat * 1000, result
+
+        # Index matches also include skill names/tags, so counts can exceed the scan's
+        print(f"  {'query':<20} {'scan ms':>9} {'index ms':>9} {'scan n':>7} {'index n':>7}")
+        for q in queries:
+            scan_ms, scan = timed(lambda: naive_search(big, q)[:page])
+            idx_ms, hits = timed(lambda: idx.search(q, limit=page))
+            note = "  (short term: LIKE full scan)" if idx.trigram and any(
+                len(t) < 3 for t in q.split()) else ""
+            print(f"  {q[:20]:<20} {scan_ms:9.3f} {idx_ms:9.3f} {len(scan):7} {len(hits):7}{note}")
+        scan_ms, _ = timed(lambda: naive_stats(big))
+        idx_ms, _ = timed(idx.stats)
+        print(f"  {'<stats>':<20} {scan_ms:9.3f} {idx_ms:9.3f}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "build"
+
+    if cmd == "build":
+        added, updated, removed = update_index(load_agents())
+        print(f"Index: +{added} ~{updated} -{removed} → {INDEX_FILE}")
+    elif cmd == "search":
+        with AgentIndex() as idx:
+            for a in idx.search(" ".join(args[1:])):
+                print(f"{a['name'][:40]:<40} {a['skills_count']:>3} skills  {a['platform']:<12} {a['url']}")
+    elif cmd == "stats":
+        with AgentIndex() as idx:
+            print(json.dumps(idx.stats(), indent=2))
+    elif cmd == "bench":
+        bench(load_agents(), args[1:] or ["agent", "weather", "defi", "hello world", "a2a", "ai"])
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,11 +7,20 @@ Usage:
     python3 scripts/crawl-agents.py                  # Run all strategies
     python3 scripts/crawl-agents.py known github ct   # Run specific strategies
     python3 scripts/crawl-agents.py --register URL    # Register found agents to AgentPages
+    python3 scripts/crawl-agents.py --profile ct      # Per-strategy/phase wall vs CPU breakdown
+
+Upstream config (env):
+    GITHUB_TOKEN / GH_TOKEN - GitHub API token (else read from gh's hosts.yml)
+    PERPLEXITY_API_KEY      - Enables the perplexity strategy
+    CRAWL_SEARCH_STUB       - JSON file {query: [url, ...]} used instead of Perplexity (tests)
 
 State files (in scripts/):
     crawl-checked.txt       - URLs already checked (resume support)
     crawl-discovered.json   - All discovered live agents
     crawl-log.txt           - Timestamped log of runs
+    crawl-index.db          - Search index + stats (see agent_index.py)
+    crawl-profile.pstats    - cProfile stats, all threads merged (--profile)
+    crawl-profile.folded    - Sampled collapsed stacks, all threads, for flamegraph.pl (--profile)
 """
 
 import json
@@ -24,10 +33,19 @@ import sys
 import os
 import re
 import hashlib
+import socket
+import threading
+import contextlib
+import cProfile
+import pstats
+import functools
+import subprocess
 import concurrent.futures
 from datetime import datetime
 from pathlib import Path
 
+import agent_index
+
 # --- Config ---
 TIMEOUT = 6
 MAX_WORKERS = 20
@@ -36,6 +54,11 @@ STATE_DIR = SCRIPT_DIR / "crawl-state"
 RESULTS_FILE = STATE_DIR / "crawl-discovered.json"
 CHECKED_FILE = STATE_DIR / "crawl-checked.txt"
 LOG_FILE = STATE_DIR / "crawl-log.txt"
+PROFILE_STATS_FILE = STATE_DIR / "crawl-profile.pstats"
+PROFILE_STACKS_FILE = STATE_DIR / "crawl-profile.folded"
+PROFILE_SAMPLE_INTERVAL = 0.005
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+PERPLEXITY_MODEL = "sonar"
 
 SSL_CTX = ssl.create_default_context()
 SSL_CTX_NOVERIFY = ssl._create_unverified_context()
@@ -56,6 +79,153 @@ def log(msg):
     with open(LOG_FILE, "a") as f:
         f.write(f"[{datetime.now().isoformat()}] {msg}\n")
 
+
+# =============================================================================
+# Profiling (--profile)
+# =============================================================================
+class Profiler:
+    """Wall vs CPU time per strategy and per phase.
+
+    Phases: upstream (API/search queries), dns, fetch (agent card requests),
+    parse, persist, sleep (deliberate rate-limit sleeps). Phases nest; each
+    one reports its exclusive time, so e.g. dns is not double-counted in fetch.
+    Phase wall time is summed across threads and can exceed the strategy's
+    wall time when a thread pool is busy. Strategy CPU is process-wide minus
+    the stack sampler's own CPU; it still includes cProfile overhead.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.strategy = "setup"
+        self.phases = {}      # (strategy, phase) -> [wall, cpu, calls]
+        self.strategies = {}  # strategy -> [wall, process cpu excluding sampler]
+        self.stacks = {}      # collapsed stack -> samples
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.cprofile = None
+        self.thread_profiles = []  # one cProfile per worker thread (< 3.12)
+        self.sampler = None
+        self.sampler_cpu = 0.0
+
+    def start(self):
+        self.enabled = True
+        socket.getaddrinfo = _timed_getaddrinfo
+        # Sampler first, so the per-thread hook below doesn't profile it
+        self.sampler = threading.Thread(target=self._sample, daemon=True)
+        self.sampler.start()
+        self.cprofile = cProfile.Profile()
+        self.cprofile.enable()
+        if sys.version_info < (3, 12):
+            # cProfile hooks only the enabling thread here; 3.12+ (sys.monitoring) sees all threads
+            threading.setprofile(self._profile_thread)
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        socket.getaddrinfo = _getaddrinfo
+        threading.setprofile(None)
+        self.cprofile.disable()
+        self.sampler.join()
+
+    def _profile_thread(self, frame, event, arg):
+        """threading.setprofile hook: swap itself for a cProfile of this thread."""
+        prof = cProfile.Profile()
+        with self.lock:
+            self.thread_profiles.append(prof)
+        prof.enable()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        stack = self.local.__dict__.setdefault("stack", [])
+        child = [0.0, 0.0]
+        stack.append(child)
+        w0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - w0, time.thread_time() - c0
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            with self.lock:
+                t = self.phases.setdefault((self.strategy, name), [0.0, 0.0, 0])
+                t[0] += wall - child[0]
+                t[1] += cpu - child[1]
+                t[2] += 1
+
+    @contextlib.contextmanager
+    def run(self, strategy):
+        """Attribute everything until exit to `strategy` (strategies run one at a time)."""
+        self.strategy = strategy
+        w0, c0, s0 = time.perf_counter(), time.process_time(), self.sampler_cpu
+        try:
+            yield
+        finally:
+            if self.enabled:
+                t = self.strategies.setdefault(strategy, [0.0, 0.0])
+                t[0] += time.perf_counter() - w0
+                t[1] += time.process_time() - c0 - (self.sampler_cpu - s0)
+
+    def _sample(self):
+        """Wall-clock stack sampler: also catches threads blocked in sockets/sleep."""
+        me = threading.get_ident()
+        names = {}
+        while self.enabled:
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if tid not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(f"{self.strategy};{names.get(tid, tid)}")
+                key = ";".join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.sampler_cpu = time.thread_time()
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+
+    def report(self):
+        STATE_DIR.mkdir(exist_ok=True)
+        merged = pstats.Stats(self.cprofile)
+        for prof in self.thread_profiles:  # pool threads have exited by now
+            merged.add(prof)
+        merged.dump_stats(str(PROFILE_STATS_FILE))
+        PROFILE_STACKS_FILE.write_text(
+            ''.join(f"{k} {n}\n" for k, n in sorted(self.stacks.items())))
+
+        print()
+        print(f"{'PROFILE':<24} {'wall s':>9} {'cpu s':>9} {'calls':>7}   (cpu includes cProfile overhead)")
+        for strategy, (wall, cpu) in self.strategies.items():
+            print(f"{strategy:<24} {wall:9.2f} {cpu:9.2f}")
+            rows = [(p, t) for (s, p), t in self.phases.items() if s == strategy]
+            for p, (pwall, pcpu, calls) in sorted(rows, key=lambda r: -r[1][0]):
+                print(f"  {p:<22} {pwall:9.2f} {pcpu:9.2f} {calls:>7}")
+        slept = sum(t[0] for (s, p), t in self.phases.items() if p == "sleep")
+        print(f"{'Deliberate sleeps':<24} {slept:9.2f}")
+        print(f"pstats:  {PROFILE_STATS_FILE}  (python3 -m pstats, all threads merged)")
+        print(f"stacks:  {PROFILE_STACKS_FILE}  (flamegraph.pl {PROFILE_STACKS_FILE.name} > flame.svg)")
+
+
+PROFILER = Profiler()
+_getaddrinfo = socket.getaddrinfo
+
+def _timed_getaddrinfo(*args, **kwargs):
+    with PROFILER.phase("dns"):
+        return _getaddrinfo(*args, **kwargs)
+
+def sleep(secs):
+    """Deliberate (rate-limit) sleep, reported separately under --profile."""
+    with PROFILER.phase("sleep"):
+        time.sleep(secs)
+
 def load_state():
     global checked_urls, discovered
     STATE_DIR.mkdir(exist_ok=True)
@@ -69,20 +239,25 @@ def load_state():
         log(f"Resume: {len(discovered)} previously discovered agents")
 
 def save_state():
-    STATE_DIR.mkdir(exist_ok=True)
-    CHECKED_FILE.write_text('\n'.join(sorted(checked_urls)))
-    output = {
-        "metadata": {
-            "last_updated": datetime.now().isoformat(),
-            "total_discovered": len(discovered),
-            "total_urls_checked": len(checked_urls),
-        },
-        "agents": discovered
-    }
-    RESULTS_FILE.write_text(json.dumps(output, indent=2))
+    with PROFILER.phase("persist"):
+        STATE_DIR.mkdir(exist_ok=True)
+        CHECKED_FILE.write_text('\n'.join(sorted(checked_urls)))
+        output = {
+            "metadata": {
+                "last_updated": datetime.now().isoformat(),
+                "total_discovered": len(discovered),
+                "total_urls_checked": len(checked_urls),
+            },
+            "agents": discovered
+        }
+        RESULTS_FILE.write_text(json.dumps(output, indent=2))
 
-def fetch(url, timeout=TIMEOUT):
+def fetch(url, timeout=TIMEOUT, phase="fetch"):
     """Fetch URL -> (status_code, body) or (error_str, None)."""
+    with PROFILER.phase(phase):
+        return _fetch(url, timeout)
+
+def _fetch(url, timeout):
     try:
         req = urllib.request.Request(url, headers={
             'User-Agent': 'AgentPages-Crawler/1.0 (+https://agentpages-iota.vercel.app)',
@@ -127,7 +302,8 @@ def check_domain(base_url):
         status, body = fetch(url)
         if status == 200 and body:
             try:
-                data = json.loads(body)
+                with PROFILER.phase("parse"):
+                    data = json.loads(body)
                 if is_valid_agent_card(data):
                     skills = data.get('skills', [])
                     agent = {
@@ -161,6 +337,126 @@ def check_domain(base_url):
     return None
 
 
+# =============================================================================
+# Upstream integrations (in-process, no subprocess per call)
+# =============================================================================
+@functools.lru_cache(maxsize=None)
+def github_token():
+    """Resolve a GitHub token once per run: env, then gh's hosts.yml, then `gh auth token`."""
+    for var in ("GH_TOKEN", "GITHUB_TOKEN"):  # same precedence as gh
+        if os.environ.get(var):
+            return os.environ[var].strip()
+    config_dir = Path(os.environ.get("GH_CONFIG_DIR") or Path.home() / ".config" / "gh")
+    hosts = config_dir / "hosts.yml"
+    if hosts.exists():
+        # Only a direct child of github.com: is the active account's token;
+        # deeper ones belong to other accounts under `users:`.
+        host = child_indent = None
+        for line in hosts.read_text().splitlines():
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            indent = len(line) - len(line.lstrip())
+            if indent == 0:
+                host, child_indent = line.rstrip(":").strip(), None
+                continue
+            if host != "github.com":
+                continue
+            if child_indent is None:
+                child_indent = indent
+            if indent == child_indent and line.strip().startswith("oauth_token:"):
+                token = line.split(":", 1)[1].strip().strip("'\"")
+                if token:
+                    return token
+    # Newer gh keeps the token in the system keyring; fall back to the CLI once
+    try:
+        out = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class SearchProvider:
+    """Web search backend for strategy_perplexity.
+
+    search(query) returns a list of {"url", "title", "query"} dicts.
+    """
+    name = "base"
+
+    def search(self, query):
+        raise NotImplementedError
+
+    def search_many(self, queries):
+        """Run queries concurrently -> {query: results}. Failed queries map to []."""
+        def run(q):
+            try:
+                with PROFILER.phase("upstream"):
+                    return self.search(q)
+            except Exception as e:
+                log(f"  → {self.name} error for '{q[:40]}': {e}")
+                return []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(queries))) as ex:
+            return dict(zip(queries, ex.map(run, queries)))
+
+
+class PerplexityProvider(SearchProvider):
+    """Perplexity chat completions API: citations + URLs mentioned in the answer."""
+    name = "perplexity"
+
+    def __init__(self, api_key, model=PERPLEXITY_MODEL, timeout=60):
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+
+    def search(self, query):
+        req = urllib.request.Request(
+            PERPLEXITY_API_URL,
+            data=json.dumps({
+                "model": self.model,
+                "messages": [{"role": "user", "content": query}],
+            }).encode(),
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "User-Agent": "AgentPages-Crawler",
+            },
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout, context=SSL_CTX) as resp:
+            raw = resp.read()
+        with PROFILER.phase("parse"):
+            data = json.loads(raw)
+            results = [{"url": r.get("url", ""), "title": r.get("title", ""), "query": query}
+                       for r in data.get("search_results") or []]
+            results += [{"url": u, "title": "", "query": query} for u in data.get("citations") or []]
+            for choice in data.get("choices") or []:
+                content = (choice.get("message") or {}).get("content") or ""
+                results += [{"url": u, "title": "", "query": query}
+                            for u in re.findall(r'https?://[^\s<>"\')\]]+', content)]
+        return results
+
+
+class StubSearchProvider(SearchProvider):
+    """Canned results for tests/offline runs: {query: [url, ...]}; "*" matches any query."""
+    name = "stub"
+
+    def __init__(self, results):
+        self.results = results
+
+    def search(self, query):
+        urls = self.results.get(query, self.results.get("*", []))
+        return [{"url": u, "title": "", "query": query} for u in urls]
+
+
+def search_provider():
+    """Pick the configured search provider, or None if there isn't one."""
+    stub = os.environ.get("CRAWL_SEARCH_STUB")
+    if stub:
+        return StubSearchProvider(json.loads(Path(stub).read_text()))
+    api_key = os.environ.get("PERPLEXITY_API_KEY")
+    if api_key:
+        return PerplexityProvider(api_key)
+    return None
+
+
 # =============================================================================
 # STRATEGY: Known URLs (already-found + educated guesses)
 # =============================================================================
@@ -200,7 +496,7 @@ def strategy_known():
 def strategy_registry():
     """Check all agents from the A2A Registry."""
     log("━━━ STRATEGY: A2A Registry ━━━")
-    token = os.popen("gh auth token 2>/dev/null").read().strip()
+    token = github_token()
     headers = {"User-Agent": "AgentPages-Crawler"}
     if token:
         headers["Authorization"] = f"token {token}"
@@ -210,23 +506,32 @@ def strategy_registry():
         "https://api.github.com/repos/prassanna-ravishankar/a2a-registry/contents/data",
         headers=headers,
     )
+    def check_entry(f):
+        try:
+            req2 = urllib.request.Request(f['download_url'], headers={"User-Agent": "AgentPages-Crawler"})
+            with PROFILER.phase("upstream"):
+                with urllib.request.urlopen(req2, timeout=8, context=SSL_CTX) as resp:
+                    raw = resp.read()
+            with PROFILER.phase("parse"):
+                data = json.loads(raw)
+            url = data.get('url', '').rstrip('/')
+            if url and url.startswith('http'):
+                check_domain(url)
+        except Exception:
+            pass
+
     try:
-        resp = urllib.request.urlopen(req, timeout=10, context=SSL_CTX)
-        files = json.loads(resp.read())
+        with PROFILER.phase("upstream"):
+            with urllib.request.urlopen(req, timeout=10, context=SSL_CTX) as resp:
+                raw = resp.read()
+        with PROFILER.phase("parse"):
+            files = json.loads(raw)
         agent_files = [f for f in files if f['name'].endswith('.json') and f['name'] != 'agents.json']
         log(f"Registry: found {len(agent_files)} agent files")
 
-        for f in agent_files:
-            try:
-                req2 = urllib.request.Request(f['download_url'], headers={"User-Agent": "AgentPages-Crawler"})
-                resp2 = urllib.request.urlopen(req2, timeout=8, context=SSL_CTX)
-                data = json.loads(resp2.read())
-                url = data.get('url', '').rstrip('/')
-                if url and url.startswith('http'):
-                    check_domain(url)
-                time.sleep(0.2)
-            except:
-                pass
+        # Raw file downloads aren't API rate-limited, so fan out like the other strategies
+        with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            list(ex.map(check_entry, agent_files))
     except Exception as e:
         log(f"Registry fetch failed: {e}")
 
@@ -237,7 +542,7 @@ def strategy_registry():
 def strategy_github():
     """Search GitHub for repos with A2A agent cards and check deployments."""
     log("━━━ STRATEGY: GitHub Code Search ━━━")
-    token = os.popen("gh auth token 2>/dev/null").read().strip()
+    token = github_token()
     if not token:
         log("⚠️  No GitHub token, skipping")
         return
@@ -270,8 +575,10 @@ def strategy_github():
 
         req = urllib.request.Request(url, headers=headers)
         try:
-            resp = urllib.request.urlopen(req, timeout=15, context=SSL_CTX)
-            data = json.loads(resp.read())
+            with PROFILER.phase("upstream"):
+                raw = urllib.request.urlopen(req, timeout=15, context=SSL_CTX).read()
+            with PROFILER.phase("parse"):
+                data = json.loads(raw)
             total = data.get('total_count', 0)
             items = data.get('items', [])
             log(f"  → {total} results, processing {len(items)}")
@@ -283,13 +590,13 @@ def strategy_github():
         except urllib.error.HTTPError as e:
             if e.code == 403:
                 log("  → Rate limited, sleeping 30s...")
-                time.sleep(30)
+                sleep(30)
             else:
                 log(f"  → HTTP {e.code}")
         except Exception as e:
             log(f"  → Error: {e}")
 
-        time.sleep(2)  # rate limit
+        sleep(2)  # rate limit
 
     log(f"GitHub: found {len(found_repos)} unique repos, checking deployments...")
 
@@ -300,8 +607,10 @@ def strategy_github():
                 f"https://api.github.com/repos/{repo}",
                 headers=headers,
             )
-            resp = urllib.request.urlopen(req, timeout=8, context=SSL_CTX)
-            rdata = json.loads(resp.read())
+            with PROFILER.phase("upstream"):
+                raw = urllib.request.urlopen(req, timeout=8, context=SSL_CTX).read()
+            with PROFILER.phase("parse"):
+                rdata = json.loads(raw)
 
             homepage = rdata.get('homepage', '') or ''
             has_pages = rdata.get('has_pages', False)
@@ -325,7 +634,8 @@ def strategy_github():
                         status, body = fetch(raw)
                         if status == 200 and body:
                             try:
-                                card = json.loads(body)
+                                with PROFILER.phase("parse"):
+                                    card = json.loads(body)
                                 if is_valid_agent_card(card):
                                     card_url = card.get('url', '')
                                     if card_url and card_url.startswith('http'):
@@ -339,7 +649,7 @@ def strategy_github():
                 if result:
                     break
 
-            time.sleep(0.3)
+            sleep(0.3)
         except:
             pass
 
@@ -375,25 +685,26 @@ def strategy_ct():
         url = f"https://crt.sh/?q={encoded}&output=json"
         log(f"CT: '{term}'")
 
-        status, body = fetch(url, timeout=20)
+        status, body = fetch(url, timeout=20, phase="upstream")
         if status == 200 and body:
             try:
-                certs = json.loads(body)
-                if isinstance(certs, list):
-                    for cert in certs:
-                        for field in ['common_name', 'name_value']:
-                            val = cert.get(field, '')
-                            for d in val.split('\n'):
-                                d = d.strip()
-                                if d and '.' in d and '*' not in d and len(d) < 100:
-                                    found_domains.add(d)
-                    if found_domains:
-                        log(f"  → {len(certs)} certs, {len(found_domains)} domains so far")
+                with PROFILER.phase("parse"):
+                    certs = json.loads(body)
+                    if isinstance(certs, list):
+                        for cert in certs:
+                            for field in ['common_name', 'name_value']:
+                                val = cert.get(field, '')
+                                for d in val.split('\n'):
+                                    d = d.strip()
+                                    if d and '.' in d and '*' not in d and len(d) < 100:
+                                        found_domains.add(d)
+                if isinstance(certs, list) and found_domains:
+                    log(f"  → {len(certs)} certs, {len(found_domains)} domains so far")
             except:
                 log(f"  → Parse error")
         else:
             log(f"  → {status}")
-        time.sleep(1.5)
+        sleep(1.5)
 
     log(f"CT: checking {len(found_domains)} domains...")
     with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
@@ -543,9 +854,9 @@ def strategy_perplexity():
     """Use Perplexity to find recently-deployed A2A agents."""
     log("━━━ STRATEGY: Perplexity Search ━━━")
 
-    search_script = os.path.expanduser("~/.claude/skills/perplexity-search/scripts/search.py")
-    if not os.path.exists(search_script):
-        log("⚠️  Perplexity search not available, skipping")
+    provider = search_provider()
+    if provider is None:
+        log("⚠️  No search provider (set PERPLEXITY_API_KEY), skipping")
         return
 
     queries = [
@@ -555,23 +866,32 @@ def strategy_perplexity():
         "Google A2A agent card example live demo endpoint",
     ]
 
-    for q in queries:
-        log(f"Perplexity: '{q[:60]}...'")
-        try:
-            result = os.popen(f'python3 "{search_script}" "{q}" 2>/dev/null').read()
-            # Extract URLs from results
-            urls = re.findall(r'https?://[^\s<>"\')\]]+', result)
-            urls = [u.rstrip('.,;:') for u in urls if 'perplexity' not in u and 'google.com/search' not in u]
-            log(f"  → Found {len(urls)} URLs to check")
-            for url in set(urls):
-                check_domain(url.rstrip('/'))
-        except Exception as e:
-            log(f"  → Error: {e}")
-        time.sleep(1)
+    log(f"Perplexity: {len(queries)} queries via {provider.name}...")
+    urls = set()
+    for q, results in provider.search_many(queries).items():
+        found = [r["url"].rstrip('.,;:') for r in results if r.get("url")]
+        found = [u for u in found if 'perplexity' not in u and 'google.com/search' not in u]
+        log(f"  '{q[:60]}...' → {len(found)} URLs")
+        urls.update(u.rstrip('/') for u in found)
 
+    log(f"Perplexity: checking {len(urls)} URLs...")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        list(ex.map(check_domain, sorted(urls)))
     log("Perplexity: done")
 
 
+# =============================================================================
+# Search index
+# =============================================================================
+def update_search_index():
+    """Incrementally sync crawl-index.db with the discovered agents."""
+    try:
+        added, updated, removed = agent_index.update_index(discovered)
+        log(f"Search index: +{added} ~{updated} -{removed} ({len(discovered)} agents)")
+    except Exception as e:
+        log(f"⚠️  Search index update failed: {e}")
+
+
 # =============================================================================
 # Generate AgentPages registration script
 # =============================================================================
@@ -646,7 +966,13 @@ def main():
     print(f"║  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}                                     ║")
     print("╚══════════════════════════════════════════════════════════════╝")
 
-    load_state()
+    args = sys.argv[1:]
+    if "--profile" in args:
+        args = [a for a in args if a != "--profile"]
+        PROFILER.start()
+
+    with PROFILER.run("setup"):
+        load_state()
     stats["started"] = datetime.now().isoformat()
 
     strategies = {
@@ -660,30 +986,35 @@ def main():
     }
 
     # Parse args
-    args = sys.argv[1:]
     if "--register" in args:
         api_url = args[args.index("--register") + 1] if len(args) > args.index("--register") + 1 else None
-        if api_url:
-            # TODO: direct API registration
-            pass
-        else:
-            generate_registration_script()
+        with PROFILER.run("report"):
+            if api_url:
+                # TODO: direct API registration
+                pass
+            else:
+                with PROFILER.phase("persist"):
+                    generate_registration_script()
+        if PROFILER.enabled:
+            PROFILER.stop()
+            PROFILER.report()
         return
 
     selected = [a for a in args if a in strategies] or list(strategies.keys())
 
     for name in selected:
         if name in strategies:
-            try:
-                strategies[name]()
-            except KeyboardInterrupt:
-                log("⚠️  Interrupted! Saving...")
+            with PROFILER.run(name):
+                try:
+                    strategies[name]()
+                except KeyboardInterrupt:
+                    log("⚠️  Interrupted! Saving...")
+                    save_state()
+                    break
+                except Exception as e:
+                    log(f"❌ Strategy '{name}' failed: {e}")
+                    import traceback; traceback.print_exc()
                 save_state()
-                break
-            except Exception as e:
-                log(f"❌ Strategy '{name}' failed: {e}")
-                import traceback; traceback.print_exc()
-            save_state()
 
     # Final report
     print()
@@ -705,11 +1036,18 @@ def main():
     print("╚══════════════════════════════════════════════════════════════╝")
 
     # Generate registration script
-    generate_registration_script()
+    with PROFILER.run("report"):
+        with PROFILER.phase("persist"):
+            generate_registration_script()
+            update_search_index()
 
     print(f"\nState: {STATE_DIR}")
     print(f"Register: bash {SCRIPT_DIR}/register-discovered.sh")
 
+    if PROFILER.enabled:
+        PROFILER.stop()
+        PROFILER.report()
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,89 @@
+"""Tests for agent_index.py. Run: python3 -m pytest scripts"""
+
+import pytest
+
+import agent_index
+
+
+def card(aid, name, description="", url="https://x.example.com", proto="0.3.0", skills=()):
+    return {
+        "id": aid, "name": name, "description": description, "url": url,
+        "protocol_version": proto,
+        "skills": [{"name": s, "tags": [s.lower()]} for s in skills],
+    }
+
+
+AGENTS = [
+    card("a1", "Weather Agent", "Forecasts", "https://weather-agent.vercel.app", skills=["Forecast"]),
+    card("a2", "defi_agent", "Swaps 100% on-chain", "https://defi.fly.dev", "1.0", ["Swap", "Quote"]),
+    card("a3", "Hello World", "Says hello", "https://hello.example.com", None),
+]
+
+
+@pytest.fixture
+def idx():
+    with agent_index.AgentIndex(":memory:") as i:
+        yield i
+
+
+def test_counts_follow_add_update_remove(idx):
+    assert idx.update(AGENTS) == (3, 0, 0)
+    assert idx.stats() == agent_index.naive_stats(AGENTS)
+
+    changed = [AGENTS[0], dict(AGENTS[1], skills=[], protocol_version="")]
+    assert idx.update(changed) == (0, 1, 1)
+    assert idx.stats() == agent_index.naive_stats(changed)
+    assert idx.stats()["protocol_versions"] == {"0.3.0": 1, "unknown": 1}
+
+    assert idx.update(changed) == (0, 0, 0)
+    assert idx.update([]) == (0, 0, 2)
+    assert idx.stats() == {"total_agents": 0, "total_skills": 0,
+                           "platforms": {}, "protocol_versions": {}}
+
+
+def test_malformed_cards_do_not_abort_sync(idx):
+    bad = [
+        card("b1", "Bad URL", url="http://[oops"),
+        dict(card("b2", "List proto"), protocol_version=["0.3.0"]),
+        dict(card("b3", {"not": "a name"}), skills="nope"),
+        dict(card("b4", "String tags"), skills=[{"name": "S", "tags": "weather"}]),
+        dict(card("b5", "No id"), id=None),
+    ]
+    agents = AGENTS + bad
+    assert idx.update(agents) == (7, 0, 0)
+    assert idx.stats() == agent_index.naive_stats([a for a in agents if a["id"]])
+    assert idx.stats()["platforms"]["custom"] == 5
+    assert idx.search("String tags")[0]["tags"] == []
+
+
+def test_search_fields(idx):
+    idx.update(AGENTS)
+    assert [a["id"] for a in idx.search("weather")] == ["a1"]
+    assert [a["id"] for a in idx.search("quote")] == ["a2"]        # skill name / tag
+    assert [a["id"] for a in idx.search("hello world")] == ["a3"]
+    assert idx.search("nothing-like-this") == []
+    assert len(idx.search("")) == 3
+
+
+def test_like_wildcards_are_literal(idx):
+    idx.update(AGENTS)
+    if not idx.trigram:
+        pytest.skip("SQLite without trigram tokenizer")
+    assert [a["id"] for a in idx.search("_")] == ["a2"]
+    assert [a["id"] for a in idx.search("%")] == ["a2"]
+    assert idx.search("\\") == []
+
+
+def test_unicode61_fallback_ignores_punctuation():
+    class WordIndex(agent_index.AgentIndex):
+        def _init_schema(self):
+            self.db.execute("CREATE VIRTUAL TABLE agents_fts USING fts5("
+                            "name, description, skills, tags, tokenize='unicode61')")
+            super()._init_schema()
+
+    with WordIndex(":memory:") as idx:
+        idx.update(AGENTS)
+        assert not idx.trigram
+        assert idx.search("+++") == []
+        assert idx.search("c++") == []
+        assert [a["id"] for a in idx.search("forec")] == ["a1"]
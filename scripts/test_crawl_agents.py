@@ -0,0 +1,161 @@
+"""Tests for crawl-agents.py upstream integrations. Run: python3 -m pytest scripts"""
+
+import importlib.util
+import io
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("crawl_agents", Path(__file__).parent / "crawl-agents.py")
+crawl = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(crawl)
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(crawl, "LOG_FILE", tmp_path / "crawl-log.txt")
+    for var in ("GH_TOKEN", "GITHUB_TOKEN", "CRAWL_SEARCH_STUB", "PERPLEXITY_API_KEY"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("GH_CONFIG_DIR", str(tmp_path / "gh"))
+    crawl.github_token.cache_clear()
+    yield
+    crawl.github_token.cache_clear()
+
+
+# --- Search providers ---
+
+def test_search_provider_selection(tmp_path, monkeypatch):
+    assert crawl.search_provider() is None
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "k")
+    assert isinstance(crawl.search_provider(), crawl.PerplexityProvider)
+    stub = tmp_path / "stub.json"
+    stub.write_text(json.dumps({"q": ["https://a.dev"], "*": ["https://b.dev"]}))
+    monkeypatch.setenv("CRAWL_SEARCH_STUB", str(stub))
+    provider = crawl.search_provider()
+    assert isinstance(provider, crawl.StubSearchProvider)
+    assert provider.search("q") == [{"url": "https://a.dev", "title": "", "query": "q"}]
+    assert provider.search("other")[0]["url"] == "https://b.dev"
+
+
+def test_search_many_runs_queries_concurrently():
+    queries = ["q1", "q2", "q3", "q4"]
+    barrier = threading.Barrier(len(queries), timeout=5)
+
+    class Concurrent(crawl.StubSearchProvider):
+        def search(self, query):
+            barrier.wait()  # BrokenBarrierError unless all queries are in flight together
+            return super().search(query)
+
+    results = Concurrent({"*": ["https://a.dev"]}).search_many(queries)
+    assert list(results) == queries
+    assert all(r[0]["url"] == "https://a.dev" for r in results.values())
+
+
+def test_search_many_isolates_failing_queries():
+    class Flaky(crawl.StubSearchProvider):
+        def search(self, query):
+            if query == "bad":
+                raise RuntimeError("boom")
+            return super().search(query)
+
+    results = Flaky({"*": ["https://a.dev"]}).search_many(["ok", "bad"])
+    assert results["bad"] == []
+    assert len(results["ok"]) == 1
+
+
+def test_perplexity_provider_parses_structured_response(monkeypatch):
+    body = json.dumps({
+        "search_results": [{"url": "https://b.dev", "title": "B"}],
+        "citations": ["https://a.dev"],
+        "choices": [{"message": {"content": "see (https://c.fly.dev)"}}],
+    }).encode()
+    monkeypatch.setattr(crawl.urllib.request, "urlopen", lambda req, **kw: io.BytesIO(body))
+    urls = [r["url"] for r in crawl.PerplexityProvider("k").search("q")]
+    assert urls == ["https://b.dev", "https://a.dev", "https://c.fly.dev"]
+
+
+def test_strategy_perplexity_uses_stub(tmp_path, monkeypatch):
+    stub = tmp_path / "stub.json"
+    stub.write_text(json.dumps({"*": [
+        "https://agent.vercel.app/", "https://agent.vercel.app.", "https://www.perplexity.ai/x",
+    ]}))
+    monkeypatch.setenv("CRAWL_SEARCH_STUB", str(stub))
+    checked = []
+    monkeypatch.setattr(crawl, "check_domain", checked.append)
+    crawl.strategy_perplexity()
+    assert checked == ["https://agent.vercel.app"]
+
+
+def test_strategy_registry_checks_every_entry(monkeypatch):
+    listing = [{"name": f"a{i}.json", "download_url": f"https://raw/a{i}.json"} for i in range(5)]
+    listing.append({"name": "agents.json", "download_url": "https://raw/agents.json"})
+
+    def urlopen(req, **kw):
+        url = req.full_url
+        if url.endswith("/contents/data"):
+            return io.BytesIO(json.dumps(listing).encode())
+        if url.endswith("a3.json"):
+            raise OSError("down")
+        return io.BytesIO(json.dumps({"url": url.replace("https://raw/", "https://") + "/"}).encode())
+
+    monkeypatch.setattr(crawl.urllib.request, "urlopen", urlopen)
+    monkeypatch.setenv("GH_TOKEN", "t")
+    checked = []
+    monkeypatch.setattr(crawl, "check_domain", checked.append)
+    crawl.strategy_registry()
+    assert sorted(checked) == ["https://a0.json", "https://a1.json", "https://a2.json", "https://a4.json"]
+
+
+# --- GitHub token ---
+
+def write_hosts(tmp_path, text):
+    (tmp_path / "gh").mkdir(exist_ok=True)
+    (tmp_path / "gh" / "hosts.yml").write_text(text)
+
+
+@pytest.fixture
+def gh_cli(monkeypatch):
+    calls = []
+
+    def run(cmd, **kw):
+        calls.append(cmd)
+        return type("Out", (), {"stdout": "gho_CLI\n"})()
+    monkeypatch.setattr(crawl.subprocess, "run", run)
+    return calls
+
+
+def test_github_token_env_precedence(monkeypatch, gh_cli):
+    monkeypatch.setenv("GITHUB_TOKEN", "a")
+    monkeypatch.setenv("GH_TOKEN", "b")
+    assert crawl.github_token() == "b"
+    assert gh_cli == []
+
+
+def test_github_token_uses_active_account(tmp_path, gh_cli):
+    write_hosts(tmp_path, (
+        "github.com:\n"
+        "    users:\n"
+        "        alice-old:\n"
+        "            oauth_token: gho_OLD\n"
+        "    user: bob\n"
+        "    oauth_token: gho_ACTIVE\n"
+    ))
+    assert crawl.github_token() == "gho_ACTIVE"
+    assert gh_cli == []
+
+
+def test_github_token_falls_back_to_cli_once(tmp_path, gh_cli):
+    write_hosts(tmp_path, (
+        "ghe.corp:\n"
+        "    oauth_token: gho_GHE\n"
+        "github.com:\n"
+        "    users:\n"
+        "        bob:\n"
+        "            oauth_token: gho_NESTED\n"
+        "    user: bob\n"
+    ))
+    assert crawl.github_token() == "gho_CLI"
+    assert crawl.github_token() == "gho_CLI"
+    assert gh_cli == [["gh", "auth", "token"]]